@@ -28,6 +28,7 @@ This file is part of FFcuesplitter.
 """
 import os
 import logging
+import functools
 from dataclasses import dataclass, asdict
 import chardet
 from deflacue.deflacue import CueParser
@@ -39,6 +40,24 @@ from ffcuesplitter.ffprobe import ffprobe
 from ffcuesplitter.ffmpeg import FFMpeg
 
 
+@functools.lru_cache(maxsize=8)
+def parse_cuefile(filename, mtime_ns, size):
+    """
+    Gets cue file bytes for character set encoding
+    then parses the file via deflacue.
+    Results are cached by pathname, modification time and
+    size, so a cue file is parsed again only when changed.
+
+    Returns:
+        tuple(chardet data, deflacue data)
+    """
+    with open(filename, 'rb') as file:
+        cue_encoding = chardet.detect(file.read())
+
+    parser = CueParser.from_file(filename, encoding=cue_encoding['encoding'])
+    return cue_encoding, parser.run()
+
+
 @dataclass
 class DataArgs:
     """
@@ -56,6 +75,7 @@ class DataArgs:
     progress_meter: str = "standard"
     dry: bool = False
     prg_loglevel: str = 'info'
+    logname: str = 'ffcuesplitter.log'
     testpatch: bool = False  # must be `True` only using test cases
 
     def asdict(self) -> dict:
@@ -123,6 +143,9 @@ class FFCueSplitter(FFMpeg):
                 Set the logging level of tracking events to console,
                 one of ("error", "warning", "info", "debug"),
                 default is `info`.
+        logname:
+                name of the log file written to the files destination
+                directory, default is 'ffcuesplitter.log'.
         testpatch:
                 Used for test cases only (do not use for normal tasks).
         """
@@ -145,7 +168,7 @@ class FFCueSplitter(FFMpeg):
         else:
             self.kwargs['outputdir'] = os.path.abspath(outputdir)
         self.kwargs['logtofile'] = os.path.join(self.kwargs['outputdir'],
-                                                'ffcuesplitter.log')
+                                                self.kwargs['logname'])
         self.kwargs['tempdir'] = '.'
 
         self.audiotracks = None
@@ -160,14 +183,13 @@ class FFCueSplitter(FFMpeg):
         """
         Clear the log file before writing it back
         """
-        if os.path.exists(self.kwargs['logtofile']):
-            if os.path.isfile(self.kwargs['logtofile']):
-                with open(self.kwargs['logtofile'],
-                          "w",
-                          encoding='utf-8',
-                          ):
-                    logging.debug("Log file clearing: '%s'",
-                                  self.kwargs['logtofile'])
+        if os.path.isfile(self.kwargs['logtofile']):
+            with open(self.kwargs['logtofile'],
+                      "w",
+                      encoding='utf-8',
+                      ):
+                logging.debug("Log file clearing: '%s'",
+                              self.kwargs['logtofile'])
     # ----------------------------------------------------------------#
 
     def get_track_durations(self, audiotracks):
@@ -284,7 +306,7 @@ class FFCueSplitter(FFMpeg):
             self.kwargs['outputdir'] = os.path.join(self.kwargs['outputdir'],
                                                     subdirs)
             self.kwargs['logtofile'] = os.path.join(self.kwargs['outputdir'],
-                                                    'ffcuesplitter.log')
+                                                    self.kwargs['logname'])
         else:
             raise FFCueSplitterError(f"Invalid argument: "
                                      f"'{self.kwargs['collection']}'")
@@ -294,30 +316,27 @@ class FFCueSplitter(FFMpeg):
         """
         Cue file check
         """
-        filesuffix = os.path.splitext(self.kwargs['filename'])[1]
-        isfile = os.path.isfile(self.kwargs['filename'])
+        filename = self.kwargs['filename']
 
-        if not isfile or filesuffix not in ('.cue', '.CUE'):
+        if (not filename.lower().endswith('.cue')
+                or not os.path.isfile(filename)):
             raise InvalidFileError(f"Invalid CUE sheet file: "
                                    f"'{self.kwargs['filename']}'")
     # ----------------------------------------------------------------#
 
     def open_cuefile(self):
         """
-        Gets cue file bytes for character set encoding
-        then starts file parsing via deflacue.
+        Gets the (cached) cue file parsing data, then
+        handles the deflacue data.
         """
         logging.debug("Processing: '%s'", self.kwargs['filename'])
         self.check_cuefile()
         curdir = os.getcwd()
         os.chdir(self.kwargs['dirname'])
 
-        with open(self.kwargs['filename'], 'rb') as file:
-            cuebyte = file.read()
-            self.cue_encoding = chardet.detect(cuebyte)
-
-        parser = CueParser.from_file(self.kwargs['filename'],
-                                     encoding=self.cue_encoding['encoding'])
-        self.cue = parser.run()
+        fstat = os.stat(self.kwargs['filename'])
+        self.cue_encoding, self.cue = parse_cuefile(self.kwargs['filename'],
+                                                    fstat.st_mtime_ns,
+                                                    fstat.st_size)
         self.deflacue_object_handler()
         os.chdir(curdir)
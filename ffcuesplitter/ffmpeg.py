@@ -123,8 +123,7 @@ class FFMpeg:
             cmd += f' {codec}'
             cmd += f" {self.kwargs['ffmpeg_add_params']}"
             cmd += ' -y'
-            num = str(track['TRACK_NUM']).rjust(2, '0')
-            name = f'{num} - {track["TITLE"]}.{suffix}'
+            name = f'{int(track["TRACK_NUM"]):02d} - {track["TITLE"]}.{suffix}'
             cmd += f' "{os.path.join(self.kwargs["tempdir"], name)}"'
             args = (cmd, {'duration': track['DURATION'], 'titletrack': name})
             data.append(args)
@@ -196,8 +195,8 @@ class FFMpeg:
                            universal_newlines=True) as proc:
 
                     for output in proc.stdout:
-                        if "out_time_ms" in output.strip():
-                            out_time_ms_val = output.split('=')[1].strip()
+                        if output.startswith('out_time_ms='):
+                            out_time_ms_val = output.partition('=')[2].strip()
                             if out_time_ms_val.isdigit():
                                 s_processed = int(out_time_ms_val) / 1_000_000
                                 percent = s_processed / seconds * 100
@@ -27,6 +27,9 @@ This file is part of FFcuesplitter.
     along with FFcuesplitter.  If not, see <http://www.gnu.org/licenses/>.
 """
 import argparse
+import concurrent.futures
+import itertools
+import os
 from ffcuesplitter.about import (APPNAME,
                                  SHORT_DESCRIPT,
                                  VERSION,
@@ -38,6 +41,7 @@ from ffcuesplitter.str_utils import (msgdebug,
                                      )
 from ffcuesplitter.user_service import (FileSystemOperations,
                                         FileFinder,
+                                        _is_walked,
                                         )
 from ffcuesplitter.exceptions import (InvalidFileError,
                                       FFCueSplitterError,
@@ -46,10 +50,54 @@ from ffcuesplitter.exceptions import (InvalidFileError,
                                       )
 
 
-def main():
+def unique_pathnames(pathnames, recursive=False):
+    """
+    Returns the given pathnames as absolute pathnames, removing
+    those that resolve to the same file or dir. In recursive
+    mode, dirnames that are inside another given dirname are
+    also removed if the walk of the latter reaches them, since
+    they would be walked twice. Filenames are always kept.
+
+    The resolved pathnames are only used for comparisons, the
+    given ones are kept since symlinked cue files must be read
+    from the dir of the link, where their audio files are.
+    """
+    canonical = {}
+    for path in pathnames:
+        canonical.setdefault(os.path.realpath(path), os.path.abspath(path))
+    keys = sorted(canonical)
+    if not recursive:
+        return [canonical[key] for key in keys]
+
+    pruned = []
+    dirs = []
+    for key in keys:  # sorted, parents always come before subdirs
+        if os.path.isdir(key):
+            if any(key.startswith(os.path.join(q, '')) and _is_walked(key, q)
+                   for q in dirs):
+                continue
+            dirs.append(key)
+        pruned.append(canonical[key])
+    return pruned
+
+
+def skip_duplicates(pathnames):
+    """
+    Yields the given pathnames in order, skipping those
+    already yielded, e.g. a filename also found in a
+    given dirname.
+    """
+    seen = set()
+    for path in pathnames:
+        if path not in seen:
+            seen.add(path)
+            yield path
+
+
+def _build_parser():
     """
-    Defines and evaluates positional arguments
-    using the argparser module.
+    Defines the positional arguments using the argparser
+    module. The parser is built once at import time.
     """
     parser = argparse.ArgumentParser(prog=APPNAME,
                                      description=SHORT_DESCRIPT,
@@ -161,56 +209,122 @@ def main():
                         required=False,
                         default='info'
                         )
-    args = parser.parse_args()
+    parser.add_argument('-j', '--jobs',
+                        metavar='N',
+                        type=int,
+                        help=("Number of cue files to process in parallel, "
+                              "default is 1. Values greater than 1 require "
+                              "the `never` or `always` overwrite option, "
+                              "each job writes its own "
+                              "`ffcuesplitter_N.log` log file."),
+                        required=False,
+                        default=1
+                        )
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def process_cuefile(kwargs):
+    """
+    Processes a single cue file with the given keyword arguments.
+    It is called in a separate process when running parallel jobs.
+
+    Returns:
+        an error message if the processing failed, None otherwise.
+    """
+    msgcolor(green='FFcuesplitter: ',
+             tail=f"Processing: '{kwargs['filename']}'")
+    try:
+        split = FileSystemOperations(**kwargs)
+        if kwargs['dry']:
+            split.dry_run_mode()
+        else:
+            overwr = split.check_for_overwriting()
+            if not overwr:
+                split.work_on_temporary_directory()
 
-    find = FileFinder(args.input_fd)  # get all cue files
+    except (InvalidFileError,
+            FFCueSplitterError,
+            FFProbeError,
+            FFMpegError,
+            ) as error:
+        return f"{error}"
+
+    return None
+
+
+def run_jobs(kwargslist, jobs=1):
+    """
+    Yields the result of `process_cuefile` for each item of
+    `kwargslist`, sequentially or across a pool of `jobs`
+    processes.
+    """
+    if jobs <= 1:
+        yield from map(process_cuefile, kwargslist)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as exe:
+        yield from exe.map(process_cuefile, kwargslist)
+
+
+def main():
+    """
+    Evaluates the command line arguments and processes
+    all the cue files found.
+    """
+    args = _PARSER.parse_args()
+
+    if args.jobs < 1:
+        _PARSER.error("argument -j/--jobs: must be a positive integer")
+    if args.jobs > 1 and args.overwrite == 'ask' and not args.dry:
+        _PARSER.error("argument -j/--jobs: parallel jobs can't ask for "
+                      "overwriting, use `-ow never` or `-ow always`")
+
+    inputs = unique_pathnames(args.input_fd, args.recursive)
+    find = FileFinder(inputs)  # get all cue files
     if args.recursive is True:
-        allfiles = find.find_files_recursively(suffix=('.cue', '.CUE'))
+        found = find.iter_files_recursively(suffix=('.cue', '.CUE'))
     else:
-        allfiles = find.find_files(suffix=('.cue', '.CUE'))
+        found = find.iter_files(suffix=('.cue', '.CUE'))
 
-    filelist = set(allfiles['FOUND']
-                   + allfiles['DISCARDED']
-                   + allfiles['INEXISTENT']
-                   )
-    if not filelist:
-        msgdebug(err="No files found.")
-        return None
+    base_kwargs = {'outputdir': args.outputdir,
+                   'collection': args.collection,
+                   'outputformat': args.format_type,
+                   'overwrite': args.overwrite,
+                   'ffmpeg_cmd': args.ffmpeg_cmd,
+                   'ffmpeg_loglevel': args.ffmpeg_loglevel,
+                   'ffmpeg_add_params': args.ffmpeg_add_params,
+                   'ffprobe_cmd': args.ffprobe_cmd,
+                   'progress_meter': args.progress_meter,
+                   'dry': args.dry,
+                   'prg_loglevel': args.prg_loglevel.upper(),
+                   'testpatch': False,
+                   }
+    # cue files are processed while the search is still in progress
+    filelist = itertools.chain(find.rejected, find.nonexistent, found)
+    filelist = skip_duplicates(filelist)
+    if args.jobs > 1:  # jobs sharing an output dir can't share the log
+        kwargslist = ({**base_kwargs,
+                       'filename': files,
+                       'logname': f'ffcuesplitter_{num}.log'}
+                      for num, files in enumerate(filelist, 1))
+    else:
+        kwargslist = ({**base_kwargs, 'filename': files}
+                      for files in filelist)
+    processed = 0
 
-    for files in filelist:
-        kwargs = {'filename': files}
-        kwargs['outputdir'] = args.outputdir
-        kwargs['collection'] = args.collection
-        kwargs['outputformat'] = args.format_type
-        kwargs['overwrite'] = args.overwrite
-        kwargs['ffmpeg_cmd'] = args.ffmpeg_cmd
-        kwargs['ffmpeg_loglevel'] = args.ffmpeg_loglevel
-        kwargs['ffmpeg_add_params'] = args.ffmpeg_add_params
-        kwargs['ffprobe_cmd'] = args.ffprobe_cmd
-        kwargs['progress_meter'] = args.progress_meter
-        kwargs['dry'] = args.dry
-        kwargs['prg_loglevel'] = args.prg_loglevel.upper()
-        kwargs['testpatch'] = False
-
-        msgcolor(green='FFcuesplitter: ',
-                 tail=f"Processing: '{kwargs['filename']}'")
-        try:
-            split = FileSystemOperations(**kwargs)
-            if kwargs['dry']:
-                split.dry_run_mode()
-            else:
-                overwr = split.check_for_overwriting()
-                if not overwr:
-                    split.work_on_temporary_directory()
-
-        except (InvalidFileError,
-                FFCueSplitterError,
-                FFProbeError,
-                FFMpegError,
-                ) as error:
-            msgdebug(err=f"{error}")
+    for error in run_jobs(kwargslist, args.jobs):
+        processed += 1
+        if error:
+            msgdebug(err=error)
             return None
 
+    if not processed:
+        msgdebug(err="No files found.")
+        return None
+
     msgend(done="Finished!")
     return None
 
@@ -8,6 +8,29 @@ license: GPL3
 Rev: Jan 29 2023
 Code checker: flake8, pylint
 """
+import sys
+
+# ANSI escape sequences built once at import time, only when
+# the standard output is a terminal (no escapes in logs/pipes)
+_TTY = sys.stdout is not None and sys.stdout.isatty()
+
+if _TTY:
+    _INFO = "\033[32;1mINFO:\033[0m "
+    _WARN = "\033[33;1mWARNING:\033[0m "
+    _ERR = "\033[31;1mERROR:\033[0m "
+    _ORANGE = "\033[33;1m"
+    _GREEN = "\033[32;1m"
+    _AZURE = "\033[34;1m"
+    _RESET = "\033[0m"
+    _FINISHED = "\033[32;1mFinished!\033[0m\n"
+    _ABORT = "\033[31;1mAbort!\033[0m\n"
+else:
+    _INFO = "INFO: "
+    _WARN = "WARNING: "
+    _ERR = "ERROR: "
+    _ORANGE = _GREEN = _AZURE = _RESET = ""
+    _FINISHED = "Finished!\n"
+    _ABORT = "Abort!\n"
 
 
 def msgdebug(head='', info=None, warn=None, err=None, tail=''):
@@ -21,11 +44,11 @@ def msgdebug(head='', info=None, warn=None, err=None, tail=''):
      ``err`` print in red color.
     """
     if info:
-        print(f"{head}\033[32;1mINFO:\033[0m {info}{tail}")
+        print(head, _INFO, info, tail, sep='')
     elif warn:
-        print(f"{head}\033[33;1mWARNING:\033[0m {warn}{tail}")
+        print(head, _WARN, warn, tail, sep='')
     elif err:
-        print(f"{head}\033[31;1mERROR:\033[0m {err}{tail}")
+        print(head, _ERR, err, tail, sep='')
 
 
 def msgcolor(head='', orange=None, green=None, azure=None, tail=''):
@@ -38,13 +61,23 @@ def msgcolor(head='', orange=None, green=None, azure=None, tail=''):
              at the end of the string.
     """
     if orange:
-        print(f"{head}\033[33;1m{orange}\033[0m{tail}")
+        print(head, _ORANGE, orange, _RESET, tail, sep='')
 
     elif green:
-        print(f"{head}\033[32;1m{green}\033[0m{tail}")
+        print(head, _GREEN, green, _RESET, tail, sep='')
 
     elif azure:
-        print(f"{head}\033[34;1m{azure}\033[0m{tail}")
+        print(head, _AZURE, azure, _RESET, tail, sep='')
+
+
+def inputcolor(orange='', tail=''):
+    """
+    Read a line from input using a prompt with
+    the ``orange`` string in yellow color:
+    ``tail`` can be used for additionals custom string to use
+             at the end of the prompt.
+    """
+    return input(f'{_ORANGE}{orange}{_RESET}{tail}')
 
 
 def msgend(done=None, abort=None):
@@ -52,9 +85,9 @@ def msgend(done=None, abort=None):
     Print status messages at the end of the tasks
     """
     if done:
-        print("\033[32;1mFinished!\033[0m\n")
+        print(_FINISHED)
     elif abort:
-        print("\033[31;1mAbort!\033[0m\n")
+        print(_ABORT)
 
 
 def msg(message):
@@ -27,11 +27,19 @@ This file is part of FFcuesplitter.
     along with FFcuesplitter.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
+import stat
 import shutil
 import tempfile
 import logging
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from ffcuesplitter.cuesplitter import FFCueSplitter
 from ffcuesplitter.exceptions import FFCueSplitterError
+from ffcuesplitter.str_utils import inputcolor
+from ffcuesplitter.utils import makeoutputdirs, drop_page_cache
+
+# Valid answers to the overwriting prompt
+_ANSWERS = frozenset(('y', 'n', 'always', 'never'))
 
 
 class FileSystemOperations(FFCueSplitter):
@@ -68,8 +76,25 @@ class FileSystemOperations(FFCueSplitter):
         self.kwargs['tempdir'] = self.kwargs['outputdir']
         recipes = self.commandargs(self.audiotracks)
         for args in recipes['recipes']:
-            msg = f'{args[0]}\n'
-            logging.info(msg)
+            logging.info('%s', args[0])
+    # ----------------------------------------------------------------#
+
+    @staticmethod
+    def ask_for_overwriting(pathfile):
+        """
+        Asks the user whether to overwrite the existing
+        `pathfile` until a valid answer is given. An empty
+        answer is the default `y`.
+        Returns one of ('y', 'n', 'always', 'never').
+        """
+        logging.warning("File already exists: '%s'", pathfile)
+        while True:
+            answer = inputcolor(orange="Overwrite? [Y/n/always/never]",
+                                tail=" > ")
+            overwr = answer.strip().lower() or 'y'
+            if overwr in _ANSWERS:
+                return overwr
+            logging.error("Invalid option '%s'", answer)
     # ----------------------------------------------------------------#
 
     def check_for_overwriting(self):
@@ -78,7 +103,6 @@ class FileSystemOperations(FFCueSplitter):
         """
         outputdir = self.kwargs['outputdir']
         overwr = self.kwargs['overwrite']
-        tracks = self.audiotracks.copy()
 
         if overwr == 'always':
             logging.info("Overwrite existing file because "
@@ -90,35 +114,33 @@ class FileSystemOperations(FFCueSplitter):
                          "you specified 'never' option")
             return True
 
-        for data in tracks:  # self.audiotracks
-            track = (f"{str(data['TRACK_NUM']).rjust(2, '0')} - "
-                     f"{data['TITLE']}.{self.kwargs['outputformat']}")
-            pathfile = os.path.join(outputdir, track)
-
-            if os.path.exists(pathfile):
-                if overwr in ('n', 'N', 'y', 'Y', 'ask'):
-                    while True:
-                        logging.warning("File already exists: '%s'",
-                                        os.path.join(outputdir, track))
-                        overwr = input("\033[33;1mOverwrite? "
-                                       "[Y/n/always/never]\033[0m > ")
-                        if overwr in ('Y', 'y', 'n', 'N', 'always', 'never'):
-                            break
-                        logging.error("Invalid option '%s'", overwr)
-                        continue
-                if overwr == 'never':
-                    logging.info("Do not overwrite any files because "
-                                 "you specified 'never' option")
-                    return True
-
-            if overwr in ('n', 'N'):
-                del self.audiotracks[self.audiotracks.index(data)]
-
-            elif overwr in ('y', 'Y', 'always', 'never', 'ask'):
-                if overwr == 'always':
-                    logging.info("Overwrite existing file because "
-                                 "you specified the 'always' option")
-                    return False
+        if not self.audiotracks:  # nothing to check
+            return False
+
+        fmt = self.kwargs['outputformat']
+        tracknames = [f"{int(data['TRACK_NUM']):02d} - {data['TITLE']}.{fmt}"
+                      for data in self.audiotracks]
+        existing = _existing_files(outputdir, tracknames)
+        refused = set()  # existing tracks not to overwrite
+        for track in tracknames:
+            if track not in existing:
+                continue
+            overwr = self.ask_for_overwriting(os.path.join(outputdir, track))
+            if overwr == 'never':
+                logging.info("Do not overwrite any files because "
+                             "you specified 'never' option")
+                return True
+            if overwr == 'always':  # skip checking remaining tracks
+                logging.info("Overwrite existing file because "
+                             "you specified the 'always' option")
+                break
+            if overwr == 'n':
+                refused.add(track)
+
+        if refused:
+            self.audiotracks = [data for data, track in
+                                zip(self.audiotracks, tracknames)
+                                if track not in refused]
         return False
     # ----------------------------------------------------------------#
 
@@ -137,13 +159,26 @@ class FileSystemOperations(FFCueSplitter):
         logging.info("Move files to: '%s'",
                      os.path.abspath(self.kwargs['outputdir']))
         outputdir = self.kwargs['outputdir']
-
-        for track in os.listdir(self.kwargs['tempdir']):
-            try:
-                shutil.move(os.path.join(self.kwargs['tempdir'], track),
-                            os.path.join(outputdir, track))
-            except Exception as error:
-                raise FFCueSplitterError(error) from error
+        tempdir = self.kwargs['tempdir']
+
+        try:
+            same_fs = os.stat(tempdir).st_dev == os.stat(outputdir).st_dev
+            move = os.replace if same_fs else shutil.move
+            prefix = os.path.join(outputdir, '')  # joined once, w/ sep
+            with os.scandir(tempdir) as entries:
+                paths = [(entry.path, prefix + entry.name)
+                         for entry in entries]
+            if not paths:
+                return
+            # moves are independent and I/O bound, run them in threads
+            workers = min(32, (os.cpu_count() or 1) * 4, len(paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_move_file, move, src, dst)
+                           for src, dst in paths]
+                for future in as_completed(futures):
+                    future.result()
+        except Exception as error:
+            raise FFCueSplitterError(error) from error
     # ----------------------------------------------------------------#
 
     def work_on_temporary_directory(self):
@@ -159,24 +194,29 @@ class FileSystemOperations(FFCueSplitter):
         if not self.audiotracks:
             raise FFCueSplitterError('No audio tracks')
 
+        # Work inside the output dir, so that moving files
+        # to it is always a rename instead of a full copy.
+        try:
+            makeoutputdirs(self.kwargs['outputdir'])
+        except OSError as error:
+            raise FFCueSplitterError(error) from error
+
         with tempfile.TemporaryDirectory(suffix=None,
                                          prefix='ffcuesplitter_',
-                                         dir=None) as tmpdir:
+                                         dir=self.kwargs['outputdir']
+                                         ) as tmpdir:
             self.kwargs['tempdir'] = tmpdir
             recipes = self.commandargs(self.audiotracks)
 
             logging.info("Temporary Target: '%s'", self.kwargs['tempdir'])
             logging.info("Extracting audio tracks (type Ctrl+c to stop):")
 
-            count = 0
             lengh = len(recipes['recipes'])
-            for args in recipes['recipes']:
-                count += 1
-                msg = (f'TRACK {count}/{lengh} >> '
-                       f'"{args[1]["titletrack"]}" ...')
-                logging.info(msg)
+            for count, (cmd, meta) in enumerate(recipes['recipes'], 1):
+                logging.info('TRACK %d/%d >> "%s" ...',
+                             count, lengh, meta['titletrack'])
 
-                self.command_runner(args[0], args[1]['duration'])
+                self.command_runner(cmd, meta['duration'])
 
             logging.info("...done exctracting")
             # You must move the files from within the temporary context
@@ -184,6 +224,129 @@ class FileSystemOperations(FFCueSplitter):
 # ------------------------------------------------------------------------
 
 
+def _name_key(name):
+    """
+    Returns the NFC normalized and casefolded key of the given
+    file name, to match names that differ only in case or in
+    unicode normalization form.
+    """
+    return unicodedata.normalize('NFC', name).casefold()
+# ------------------------------------------------------------------------
+
+
+def _existing_files(dirname, filenames):
+    """
+    Returns the set of the given `filenames` that already
+    exist in `dirname`, reading the directory only once.
+    Names matching an entry only by case or by unicode
+    normalization form are confirmed with `os.path.exists`,
+    since only some file systems treat them as the same file.
+    If the dir can't be listed, each filename is checked
+    with `os.path.exists` instead.
+    """
+    try:
+        with os.scandir(dirname) as entries:
+            names = {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+    except OSError:
+        return {name for name in filenames
+                if os.path.exists(os.path.join(dirname, name))}
+    keys = {_name_key(name) for name in names}
+    return {name for name in filenames
+            if name in names
+            or (_name_key(name) in keys
+                and os.path.exists(os.path.join(dirname, name)))}
+# ------------------------------------------------------------------------
+
+
+def _move_file(move, src, dst):
+    """
+    Moves `src` to `dst` using the `move` callable, then
+    releases the page cache of the moved file.
+    """
+    move(src, dst)
+    drop_page_cache(dst)
+# ------------------------------------------------------------------------
+
+
+def _scandir_in_threads(dirs, suffix):
+    """
+    Runs `_scandir` on each dir of `dirs` in a pool of threads.
+    Returns the list of the files found keeping the order of
+    `dirs`. All threads are done on return, so no thread is
+    left running while the caller processes the files, e.g.
+    forking worker processes.
+    """
+    with ThreadPoolExecutor(max_workers=min(16, len(dirs))) as executor:
+        return [files for found in
+                executor.map(lambda d: list(_scandir(d, suffix)), dirs)
+                for files in found]
+# ------------------------------------------------------------------------
+
+
+def _scandir(path, suffix):
+    """
+    Generator that yields the pathnames of the files in the
+    `path` directory whose lowercased name ends with one of
+    the given `suffix` tuple.
+    """
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(suffix) and entry.is_file():
+                yield entry.path
+# ------------------------------------------------------------------------
+
+
+# System and metadata dirs that never contain cue files
+_PRUNE = frozenset({'$RECYCLE.BIN',
+                    'System Volume Information',
+                    '@eaDir',
+                    '__MACOSX',
+                    })
+
+
+def _is_walked(dirname, top):
+    """
+    Tells whether the recursive walker started from the `top`
+    dir descends into its `dirname` sub-directory, that is,
+    whether no hidden or system dir is on the way.
+    """
+    names = os.path.relpath(dirname, top).split(os.sep)
+    return not any(name.startswith('.') or name in _PRUNE for name in names)
+# ------------------------------------------------------------------------
+
+
+def _scandir_recursive(path, suffix):
+    """
+    Generator that yields the pathnames of the files in the
+    `path` directory tree whose lowercased name ends with one
+    of the given `suffix` tuple.
+    The tree is walked with an explicit stack of dirs.
+    Unreadable sub-directories are silently skipped as
+    `os.walk` does, hidden and system dirs are pruned,
+    symlinks to directories are neither followed nor yielded.
+    """
+    stack = [path]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        subdirs = []
+        subdirs_append = subdirs.append
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not (name.startswith('.') or name in _PRUNE):
+                        subdirs_append(entry.path)
+                elif name.lower().endswith(suffix) and entry.is_file():
+                    yield entry.path
+        stack.extend(reversed(subdirs))  # keeps the walking order
+# ------------------------------------------------------------------------
+
+
 class FileFinder:
     """
     Finds and collect files based on one or more suffixes in
@@ -195,13 +358,17 @@ class FileFinder:
         ff = FileFinder(target=str('pathnames'))
         or
         ff = FileFinder(target=list('pathnames',))
+        or
+        ff = FileFinder(target=pathlib.Path('pathname'))
 
     Available methods:
 
         - find_files(suffix=str or list of ('.suffix',))
         - find_files_recursively(suffix=str or list of ('.suffix',))
+        - iter_files(suffix=str or list of ('.suffix',))
+        - iter_files_recursively(suffix=str or list of ('.suffix',))
 
-    Always returns a dictionary with three keys:
+    The `find_*` methods always returns a dictionary with three keys:
     `FOUND`, `DISCARDED`, `INEXISTENT` with lists as values.
 
     If filenames are given instead of dirnames, they will be
@@ -210,44 +377,107 @@ class FileFinder:
     `INEXISTENT` key. All files found will be returned with
     the FOUND key.
 
+    Suffixes are matched case-insensitively, the leading dot
+    is optional.
+
+    The `iter_*` methods return an iterator of the files found
+    instead. In recursive mode, they can be processed while the
+    search is still in progress. The `rejected` and `nonexistent`
+    attributes are filled in as soon as the method is called.
+
     """
+    __slots__ = ('filtered', 'rejected', 'nonexistent', 'target')
+
     def __init__(self, target: str = ''):
         """
-        target: Expects a str('pathdir') or a list of ('pathdirs',)
+        target: Expects a str('pathdir') or an iterable of
+                ('pathdirs',), path-like objects are accepted too.
 
         """
         self.filtered = None
         self.rejected = None  # add here only if it's file
         self.nonexistent = None
-        self.target = tuple((target,)) if isinstance(target, str) else target
+        if isinstance(target, (str, os.PathLike)):
+            self.target = (os.fspath(target),)
+        else:
+            self.target = tuple(os.fspath(path) for path in target)
     # -------------------------------------------------------------#
 
-    def find_files_recursively(self, suffix: str = '') -> dict:
+    def _classify_targets(self):
         """
-        find files in recursive mode.
-        suffix: Expects a str(.suffix) or a list of (.suffixes,)
-        Returns: dict
+        Classifies the target pathnames with a single stat each,
+        filling in the `rejected` and `nonexistent` attributes.
+        Returns the list of the existing target dirs.
 
         """
-        self.filtered = []
         self.rejected = []  # add here only if it's file
         self.nonexistent = []
-        suffix = tuple((suffix,)) if isinstance(suffix, str) else suffix
+        rejected_append = self.rejected.append
+        nonexistent_append = self.nonexistent.append
+        onlydirs = []
+        onlydirs_append = onlydirs.append
 
-        fileswalk = {}
         for dirs in self.target:
-            if os.path.exists(dirs):
-                if os.path.isdir(dirs):
-                    for root, alldirs, allfiles in os.walk(dirs):
-                        fileswalk[root] = list(alldirs + allfiles)
-                else:
-                    self.rejected.append(dirs)  # only existing files
+            try:
+                mode = os.stat(dirs).st_mode
+            except (OSError, ValueError):
+                nonexistent_append(dirs)  # all non-existing files/dirs
+                continue
+            if stat.S_ISDIR(mode):
+                onlydirs_append(dirs)
             else:
-                self.nonexistent.append(dirs)  # all non-existing files/dirs
-        for path, name in fileswalk.items():
-            for files in name:
-                if os.path.splitext(files)[1] in suffix:
-                    self.filtered.append(os.path.join(path, files))
+                rejected_append(dirs)  # only existing files
+
+        return onlydirs
+    # -------------------------------------------------------------#
+
+    def _collect(self, suffix, walker):
+        """
+        Returns an iterator of the files found by `walker`
+        in the target dirs.
+
+        """
+        suffix = (suffix,) if isinstance(suffix, str) else suffix
+        # lowercase '.suffix' tuple for case-insensitive `str.endswith`
+        suffix = tuple(dict.fromkeys('.' + suf.lstrip('.').lower()
+                                     for suf in suffix))
+        onlydirs = self._classify_targets()
+
+        # single dir reads are latency bound on network shares, while
+        # the recursive walks are kept lazy to stream the files found
+        if walker is _scandir and len(onlydirs) > 1:
+            return iter(_scandir_in_threads(onlydirs, suffix))
+        return (files for dirs in onlydirs for files in walker(dirs, suffix))
+    # -------------------------------------------------------------#
+
+    def iter_files_recursively(self, suffix: str = ''):
+        """
+        find files in recursive mode.
+        suffix: Expects a str(.suffix) or a list of (.suffixes,)
+        Returns: generator
+
+        """
+        return self._collect(suffix, _scandir_recursive)
+    # -------------------------------------------------------------#
+
+    def iter_files(self, suffix: str = ''):
+        """
+        find files in non-recursive mode.
+        suffix: Expects a str(.suffix) or a list of (.suffixes,)
+        Returns: iterator
+
+        """
+        return self._collect(suffix, _scandir)
+    # -------------------------------------------------------------#
+
+    def find_files_recursively(self, suffix: str = '') -> dict:
+        """
+        find files in recursive mode.
+        suffix: Expects a str(.suffix) or a list of (.suffixes,)
+        Returns: dict
+
+        """
+        self.filtered = list(self.iter_files_recursively(suffix))
 
         return {"FOUND": self.filtered,
                 "DISCARDED": self.rejected,
@@ -262,21 +492,7 @@ class FileFinder:
         Returns: dict
 
         """
-        self.filtered = []
-        self.rejected = []  # add here only if it's file
-        self.nonexistent = []
-        suffix = tuple((suffix,)) if isinstance(suffix, str) else suffix
-
-        for dirs in self.target:
-            if os.path.exists(dirs):
-                if os.path.isdir(dirs):
-                    for files in os.listdir(dirs):
-                        if os.path.splitext(files)[1] in suffix:
-                            self.filtered.append(os.path.join(dirs, files))
-                else:
-                    self.rejected.append(dirs)  # only existing files
-            else:
-                self.nonexistent.append(dirs)  # all non-existing files/dirs
+        self.filtered = list(self.iter_files(suffix))
 
         return {"FOUND": self.filtered,
                 "DISCARDED": self.rejected,
@@ -25,10 +25,15 @@ This file is part of FFcuesplitter.
     along with FFcuesplitter.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
-import re
 import subprocess
 import platform
-import datetime
+
+_IS_WINDOWS = platform.system() == 'Windows'
+
+# Translation tables for `sanitize`: slash is always replaced with
+# hyphen, chars not allowed in MS-Windows file names are deleted.
+_SLASH_TABLE = str.maketrans({'/': '-'})
+_WIN_TABLE = str.maketrans({'/': '-', **dict.fromkeys('"*:<>?|\\')})
 
 
 def sanitize(string: str = 'string') -> str:
@@ -46,11 +51,13 @@ def sanitize(string: str = 'string') -> str:
 
     """
     if not isinstance(string, str):
-        raise TypeError("Expects Type string only")
+        raise TypeError(f"Expects Type string only, "
+                        f"not {type(string).__name__}")
 
-    if platform.system() == 'Windows':
-        string = re.sub(r"[\"\*\:\<\>\?\|\\]", '', string)
-    string = string.replace('/', '-')
+    if _IS_WINDOWS:
+        string = string.translate(_WIN_TABLE)
+    else:
+        string = string.translate(_SLASH_TABLE)
 
     return string.strip().strip('.')  # removes spaces and dots
 # ------------------------------------------------------------------------
@@ -59,7 +66,6 @@ def sanitize(string: str = 'string') -> str:
 def pairwise(iterable):
     """
     Return a zip object from iterable.
-    This function is used by run method.
     ----
     USAGE:
 
@@ -89,43 +95,75 @@ def pairwise(iterable):
 def frames_to_seconds(frames):
     """
     Converts frames (10407600) to seconds (236.0) and then
-    converts them to a time format string (0:03:56) using datetime.
+    converts them to a time format string (0:03:56) using
+    integer arithmetic only. Fractions of a second are given
+    in microseconds (0:03:56.500000), as `datetime.timedelta`
+    does.
     """
-    secs = frames / 44100
-    return str(datetime.timedelta(seconds=secs))
+    usecs = (frames * 1_000_000 + 22050) // 44100  # rounded
+    secs, usecs = divmod(usecs, 1_000_000)
+    mins, secs = divmod(secs, 60)
+    hours, mins = divmod(mins, 60)
+    if usecs:
+        return f'{hours}:{mins:02d}:{secs:02d}.{usecs:06d}'
+    return f'{hours}:{mins:02d}:{secs:02d}'
 # ------------------------------------------------------------------------
 
 
 def makeoutputdirs(outputdir):
     """
-    Makes the specified sub-dirctories in the outputdir
+    Makes the specified sub-dirctories in the outputdir.
+    Raises OSError (or one of its subclasses) on failure.
+    """
+    os.makedirs(outputdir, mode=0o777, exist_ok=True)
+# ------------------------------------------------------------------------
+
+
+def drop_page_cache(pathname):
     """
+    Flushes the given file to disk and advises the kernel
+    to release its pages from the page cache, since the
+    output files are not going to be read again soon.
+    Does nothing on platforms lacking `os.posix_fadvise`
+    and ignores any OS error.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(pathname, os.O_RDONLY)
+    except OSError:
+        return
     try:
-        os.makedirs(outputdir,
-                    mode=0o777,
-                    exist_ok=True
-                    )
-    except Exception as error:
-        raise ValueError(error) from error
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
 # ------------------------------------------------------------------------
 
 
+# Hides the console window of subprocesses on MS-Windows GUI's
+if _IS_WINDOWS:
+    _STARTUPINFO = subprocess.STARTUPINFO()
+    _STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+else:
+    _STARTUPINFO = None
+
+
 class Popen(subprocess.Popen):
     """
-    Inherit `subprocess.Popen` class to set `_startupinfo`.
+    Inherit `subprocess.Popen` class to set `startupinfo`.
     This avoids displaying a console window on MS-Windows
-    using GUI's .
+    using GUI's . On other platforms the inherited constructor
+    is used as is.
     """
-    if platform.system() == 'Windows':
-        _startupinfo = subprocess.STARTUPINFO()
-        _startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-    else:
-        _startupinfo = None
-
-    def __init__(self, *args, **kwargs):
-        """Constructor
-        """
-        super().__init__(*args, **kwargs, startupinfo=self._startupinfo)
+    if _IS_WINDOWS:
+        def __init__(self, *args, **kwargs):
+            """Constructor
+            """
+            kwargs['startupinfo'] = _STARTUPINFO
+            super().__init__(*args, **kwargs)
 
     # def communicate_or_kill(self, *args, **kwargs):
         # return process_communicate_or_kill(self, *args, **kwargs)
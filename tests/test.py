@@ -5,8 +5,12 @@ Porpose: Contains test cases for the FFCueSplitter object.
 Rev: Feb 06 2023
 """
 import os
+import shutil
 import sys
+import tempfile
+import unicodedata
 import unittest
+from unittest import mock
 
 
 PATH = os.path.realpath(os.path.abspath(__file__))
@@ -15,6 +19,14 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
 try:
     from ffcuesplitter.cuesplitter import FFCueSplitter
     from ffcuesplitter.exceptions import InvalidFileError
+    from ffcuesplitter.user_service import FileFinder, FileSystemOperations
+    from ffcuesplitter.utils import (frames_to_seconds,
+                                     sanitize,
+                                     )
+    from ffcuesplitter.main import (unique_pathnames,
+                                    skip_duplicates,
+                                    main as cli_main,
+                                    )
 
 except ImportError as error:
     sys.exit(error)
@@ -30,15 +42,20 @@ class ParserCueSheetTestCase(unittest.TestCase):
     """
     Test case to get data from cue sheet file
     """
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Method called to prepare the test fixture
+        Method called once to prepare the class test fixture
         """
-        self.args = {'outputdir': os.path.dirname(FILECUE_ISO),
-                     'outputformat': OUTFORMAT,
-                     'overwrite': OVERWRITE,
-                     'testpatch': True,
-                     }
+        cls.args = {'outputdir': os.path.dirname(FILECUE_ISO),
+                    'outputformat': OUTFORMAT,
+                    'overwrite': OVERWRITE,
+                    'testpatch': True,
+                    }
+        cls.split_iso = FFCueSplitter(**dict(cls.args,
+                                             filename=FILECUE_ISO))
+        cls.split_ascii = FFCueSplitter(**dict(cls.args,
+                                               filename=FILECUE_ASCII))
 
     def test_invalid_file(self):
         """
@@ -47,15 +64,27 @@ class ParserCueSheetTestCase(unittest.TestCase):
         fname = {'filename': '/invalid/file.cue'}
 
         with self.assertRaises(InvalidFileError):
-            FFCueSplitter(**{**self.args, **fname})
+            FFCueSplitter(**dict(self.args, **fname))
+
+    def test_mixed_case_suffix(self):
+        """
+        test cue files found with a mixed case suffix are accepted
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cuefile = os.path.join(tmpdir, 'B.Cue')
+            shutil.copy(FILECUE_ASCII, cuefile)
+            shutil.copy(os.path.join(WORKDIR, 'Three Samples.flac'), tmpdir)
+            found = list(FileFinder(tmpdir).iter_files(suffix='.cue'))
+            split = FFCueSplitter(**dict(self.args, filename=cuefile))
+
+            self.assertEqual(found, [cuefile])
+            self.assertEqual(split.audiotracks[0]['TITLE'], '300 Hz')
 
     def test_tracks_with_iso_file_encoding(self):
         """
         test cuefile parsing with ISO-8859-1 encoding
         """
-        fname = {'filename': FILECUE_ISO}
-        split = FFCueSplitter(**{**self.args, **fname})
-        tracks = split.audiotracks
+        tracks = self.split_iso.audiotracks
 
         self.assertEqual(tracks[0]['FILE'], 'Three Samples.flac')
         self.assertEqual(tracks[0]['END'], 88200)
@@ -67,9 +96,7 @@ class ParserCueSheetTestCase(unittest.TestCase):
         """
         test cuefile parsing with ASCII encoding
         """
-        fname = {'filename': FILECUE_ASCII}
-        split = FFCueSplitter(**{**self.args, **fname})
-        tracks = split.audiotracks
+        tracks = self.split_ascii.audiotracks
 
         self.assertEqual(tracks[0]['START'], 0)
         self.assertEqual(tracks[1]['START'], 88200)
@@ -81,26 +108,27 @@ class FFmpegArgumentsTestCase(unittest.TestCase):
     """
     Test case to get data from FFmpeg arguments building
     """
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Method called to prepare the test fixture
+        Method called once to prepare the class test fixture
         """
-        self.args = {'outputdir': os.path.dirname(FILECUE_ISO),
-                     'outputformat': OUTFORMAT,
-                     'overwrite': OVERWRITE,
-                     'dry': True,
-                     'testpatch': True,
-                     }
+        cls.args = {'outputdir': os.path.dirname(FILECUE_ISO),
+                    'outputformat': OUTFORMAT,
+                    'overwrite': OVERWRITE,
+                    'dry': True,
+                    'testpatch': True,
+                    }
+        cls.split_ascii = FFCueSplitter(**dict(cls.args,
+                                               filename=FILECUE_ASCII))
+        cls.split_ascii.kwargs['tempdir'] = os.path.abspath('.')
 
     def test_ffmpeg_arguments(self):
         """
         test argument strings and titletrack names
         """
-        fname = {'filename': FILECUE_ASCII}
-        split = FFCueSplitter(**{**self.args, **fname})
-        split.kwargs['tempdir'] = os.path.abspath('.')
-        tracks = split.audiotracks
-        data = split.commandargs(tracks)
+        split = self.split_ascii
+        data = split.commandargs(split.audiotracks)
         self.assertEqual(data['recipes'][0][0].split()[0], '"ffmpeg"')
         self.assertEqual(data['recipes'][0][1]['titletrack'],
                          '01 - 300 Hz.flac')
@@ -109,20 +137,335 @@ class FFmpegArgumentsTestCase(unittest.TestCase):
         self.assertEqual(data['recipes'][2][1]['titletrack'],
                          '03 - 500 Hz.flac')
 
+    def test_track_number_as_int(self):
+        """
+        test titletrack names of caller-supplied tracks with
+        int track numbers (deflacue gives str)
+        """
+        split = self.split_ascii
+        tracks = [dict(track, TRACK_NUM=int(track['TRACK_NUM']))
+                  for track in split.audiotracks]
+        data = split.commandargs(tracks)
+        self.assertEqual(data['recipes'][0][1]['titletrack'],
+                         '01 - 300 Hz.flac')
+
     def test_track_durations(self):
         """
         test durations of the tracks in seconds
         """
-        fname = {'filename': FILECUE_ASCII}
-        split = FFCueSplitter(**{**self.args, **fname})
-        split.kwargs['tempdir'] = os.path.abspath('.')
-        tracks = split.audiotracks
-        data = split.commandargs(tracks)
+        split = self.split_ascii
+        data = split.commandargs(split.audiotracks)
         self.assertEqual(data['recipes'][0][1]['duration'], 2.0)
         self.assertEqual(data['recipes'][1][1]['duration'], 2.0)
         self.assertEqual(data['recipes'][2][1]['duration'], 2.0)
 
 
+class OverwritingTestCase(unittest.TestCase):
+    """
+    Test case to check files overwriting on destination
+    """
+    def setUp(self):
+        """
+        Method called to prepare the test fixture
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.args = {'filename': FILECUE_ASCII,
+                     'outputdir': self.tmpdir.name,
+                     'outputformat': OUTFORMAT,
+                     'overwrite': 'ask',
+                     'testpatch': True,
+                     }
+
+    def tearDown(self):
+        """
+        Method called to clean the test fixture
+        """
+        self.tmpdir.cleanup()
+
+    def test_refused_tracks(self):
+        """
+        test that only the existing tracks refused are removed
+        """
+        for name in ('01 - 300 Hz.flac', '03 - 500 Hz.flac'):
+            with open(os.path.join(self.tmpdir.name, name), 'w',
+                      encoding='utf-8'):
+                pass
+        split = FileSystemOperations(**self.args)
+        with mock.patch('builtins.input', side_effect=['n', 'n']):
+            overwr = split.check_for_overwriting()
+
+        self.assertFalse(overwr)
+        self.assertEqual([t['TITLE'] for t in split.audiotracks], ['400 Hz'])
+
+    def test_decomposed_existing_name(self):
+        """
+        test tracks stored in a different unicode normalization
+        form are reported as existing only if the file system
+        treats them as the same file (e.g. macOS, not Linux)
+        """
+        trackname = '03 - è di 500 Hz.flac'
+        name = unicodedata.normalize('NFD', trackname)
+        with open(os.path.join(self.tmpdir.name, name), 'w',
+                  encoding='utf-8'):
+            pass
+        same = os.path.exists(os.path.join(self.tmpdir.name, trackname))
+        split = FileSystemOperations(**dict(self.args, filename=FILECUE_ISO))
+        with mock.patch('builtins.input', side_effect=['n']) as answer:
+            split.check_for_overwriting()
+
+        self.assertEqual(answer.call_count, 1 if same else 0)
+        self.assertEqual(len(split.audiotracks), 2 if same else 3)
+
+    def test_case_differing_name(self):
+        """
+        test tracks whose names differ only by case are reported
+        as existing only on case-insensitive file systems
+        """
+        with open(os.path.join(self.tmpdir.name, '01 - 300 HZ.FLAC'), 'w',
+                  encoding='utf-8'):
+            pass
+        same = os.path.exists(os.path.join(self.tmpdir.name,
+                                           '01 - 300 Hz.flac'))
+        split = FileSystemOperations(**self.args)
+        with mock.patch('builtins.input', side_effect=['n']) as answer:
+            split.check_for_overwriting()
+
+        self.assertEqual(answer.call_count, 1 if same else 0)
+
+    def test_unreadable_outputdir(self):
+        """
+        test existing tracks are still found if the output
+        directory can't be listed
+        """
+        with open(os.path.join(self.tmpdir.name, '02 - 400 Hz.flac'), 'w',
+                  encoding='utf-8'):
+            pass
+        split = FileSystemOperations(**self.args)
+        with mock.patch('os.scandir', side_effect=PermissionError), \
+                mock.patch('builtins.input', side_effect=['n']) as answer:
+            split.check_for_overwriting()
+
+        self.assertEqual(answer.call_count, 1)
+        self.assertEqual([t['TITLE'] for t in split.audiotracks],
+                         ['300 Hz', '500 Hz'])
+
+
+class FileFinderTestCase(unittest.TestCase):
+    """
+    Test case to find cue sheet files
+    """
+    def test_find_files(self):
+        """
+        test files found, discarded and inexistent
+        """
+        find = FileFinder([WORKDIR, FILECUE_ASCII, '/invalid/dir'])
+        data = find.find_files(suffix=('.cue', '.CUE'))
+
+        self.assertEqual(sorted(data['FOUND']), [FILECUE_ASCII, FILECUE_ISO])
+        self.assertEqual(data['DISCARDED'], [FILECUE_ASCII])
+        self.assertEqual(data['INEXISTENT'], ['/invalid/dir'])
+
+    def make_tree(self, root):
+        """
+        Makes a tree of files and dirs in `root` for searching,
+        returns the pathnames of the first and second target dirs.
+        """
+        first = os.path.join(root, 'first')
+        second = os.path.join(root, 'second')
+        for pathname in ('first/a.cue',
+                         'first/dir.cue/b.CUE',  # dirname with suffix
+                         'first/sub/c.cue',
+                         'first/sub/d.txt',
+                         'first/.hidden/e.cue',
+                         'first/@eaDir/f.cue',
+                         'first/sub/__MACOSX/g.cue',
+                         'first/sub/.i.cue',  # hidden filename
+                         'second/h.Cue',
+                         ):
+            pathname = os.path.join(root, pathname)
+            os.makedirs(os.path.dirname(pathname), exist_ok=True)
+            with open(pathname, 'w', encoding='utf-8'):
+                pass
+        return first, second
+
+    def test_iter_files(self):
+        """
+        test dirnames with suffix are not yielded in non-recursive mode
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = self.make_tree(tmpdir)[0]
+            found = list(FileFinder(first).iter_files(suffix='.cue'))
+
+        self.assertEqual(found, [os.path.join(first, 'a.cue')])
+
+    def test_iter_files_multiple_dirs(self):
+        """
+        test files found in multiple target dirs keep their order
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first, second = self.make_tree(tmpdir)
+            found = list(FileFinder([first, second]).iter_files('.cue'))
+
+        self.assertEqual(found, [os.path.join(first, 'a.cue'),
+                                 os.path.join(second, 'h.Cue')])
+
+    def test_iter_files_recursively(self):
+        """
+        test files found by generator in recursive mode across
+        multiple target dirs, skipping hidden and system dirs
+        but not hidden files
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first, second = self.make_tree(tmpdir)
+            find = FileFinder([first, second])
+            found = list(find.iter_files_recursively(suffix='.cue'))
+
+        self.assertEqual(find.rejected, [])
+        self.assertEqual(find.nonexistent, [])
+        self.assertEqual(sorted(found[:-1]),
+                         [os.path.join(first, 'a.cue'),
+                          os.path.join(first, 'dir.cue', 'b.CUE'),
+                          os.path.join(first, 'sub', '.i.cue'),
+                          os.path.join(first, 'sub', 'c.cue')])
+        self.assertEqual(found[-1], os.path.join(second, 'h.Cue'))
+
+
+class PathnamesTestCase(unittest.TestCase):
+    """
+    Test case for the input pathnames handling
+    """
+    def setUp(self):
+        """
+        Method called to prepare the test fixture
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = os.path.realpath(self.tmpdir.name)
+        for subdir in ('sub', '.hidden'):
+            os.mkdir(os.path.join(self.root, subdir))
+        self.cuefile = os.path.join(self.root, 'sub', 'a.cue')
+        with open(self.cuefile, 'w', encoding='utf-8'):
+            pass
+
+    def tearDown(self):
+        """
+        Method called to clean the test fixture
+        """
+        self.tmpdir.cleanup()
+
+    def test_unique_pathnames(self):
+        """
+        test duplicates are removed and nothing is pruned
+        in non-recursive mode
+        """
+        sub = os.path.join(self.root, 'sub')
+        paths = [sub, os.path.join(sub, '.'), self.root, self.cuefile]
+
+        self.assertEqual(unique_pathnames(paths),
+                         [self.root, sub, self.cuefile])
+
+    def test_unique_pathnames_recursive(self):
+        """
+        test only the dirnames walked from a parent dirname
+        are pruned in recursive mode
+        """
+        hidden = os.path.join(self.root, '.hidden')
+        paths = [os.path.join(self.root, 'sub'), hidden,
+                 self.cuefile, self.root]
+
+        self.assertEqual(unique_pathnames(paths, recursive=True),
+                         [self.root, hidden, self.cuefile])
+
+    def test_unique_pathnames_symlink(self):
+        """
+        test symlinked filenames are kept as given, while
+        still removed as duplicates of their target
+        """
+        link = os.path.join(self.root, 'link.cue')
+        os.symlink(self.cuefile, link)
+
+        self.assertEqual(unique_pathnames([link]), [link])
+        self.assertEqual(unique_pathnames([link, self.cuefile]), [link])
+
+    def test_skip_duplicates(self):
+        """
+        test a filename also found in a dirname is yielded once
+        """
+        paths = [self.cuefile, '/invalid/file.cue', self.cuefile]
+
+        self.assertEqual(list(skip_duplicates(paths)),
+                         [self.cuefile, '/invalid/file.cue'])
+
+
+class JobsArgumentTestCase(unittest.TestCase):
+    """
+    Test case to validate the -j/--jobs command line option
+    """
+    def run_cli(self, *args):
+        """
+        Runs the command line with the given options, returns
+        the exit status of the arguments parser.
+        """
+        argv = ['ffcuesplitter', '-i', FILECUE_ASCII, *args]
+        with mock.patch('sys.argv', argv), \
+                mock.patch('sys.stderr'), \
+                self.assertRaises(SystemExit) as context:
+            cli_main()
+        return context.exception.code
+
+    def test_jobs_not_positive(self):
+        """
+        test jobs less than 1 are rejected
+        """
+        self.assertEqual(self.run_cli('-j', '0', '--dry'), 2)
+
+    def test_parallel_jobs_ask_overwriting(self):
+        """
+        test parallel jobs are rejected with `-ow ask`
+        """
+        self.assertEqual(self.run_cli('-j', '2'), 2)
+        self.assertEqual(self.run_cli('-j', '2', '-ow', 'ask'), 2)
+
+    def test_parallel_jobs_dry_run(self):
+        """
+        test parallel jobs are accepted in dry run mode and
+        each job gets its own log file
+        """
+        argv = ['ffcuesplitter', '-i', FILECUE_ASCII, '-j', '2', '--dry']
+        with mock.patch('sys.argv', argv), \
+                mock.patch('sys.stdout'), \
+                mock.patch('ffcuesplitter.main.run_jobs',
+                           return_value=[None]) as run_jobs:
+            cli_main()
+        kwargslist, jobs = run_jobs.call_args[0]
+
+        self.assertEqual(jobs, 2)
+        self.assertEqual([kwargs['logname'] for kwargs in kwargslist],
+                         ['ffcuesplitter_1.log'])
+
+
+class UtilsTestCase(unittest.TestCase):
+    """
+    Test case for the utils functions
+    """
+    def test_sanitize(self):
+        """
+        test slashes, leading/trailing spaces and dots
+        """
+        self.assertEqual(sanitize(' ..AC/DC.. '), 'AC-DC')
+        self.assertEqual(sanitize('Song\xa0'), 'Song')
+        with self.assertRaises(TypeError):
+            sanitize(None)
+
+    def test_frames_to_seconds(self):
+        """
+        test conversion of frames to time format strings
+        """
+        self.assertEqual(frames_to_seconds(0), '0:00:00')
+        self.assertEqual(frames_to_seconds(10407600), '0:03:56')
+        self.assertEqual(frames_to_seconds(88200 + 22050), '0:00:02.500000')
+        self.assertEqual(frames_to_seconds(44100 * 3661), '1:01:01')
+
+
 def main():
     """
     Run